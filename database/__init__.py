@@ -0,0 +1,3 @@
+"""
+IntelliAlert Database Package
+"""
@@ -0,0 +1,206 @@
+"""
+IntelliAlert Async Database Service
+asyncpg-backed counterpart of DatabaseService for concurrent telemetry ingestion
+"""
+
+import asyncio
+import logging
+import threading
+from typing import Dict, List
+
+try:
+    import asyncpg
+    ASYNCPG_AVAILABLE = True
+except ImportError:
+    asyncpg = None
+    ASYNCPG_AVAILABLE = False
+
+from .db_service import DatabaseConnectionError, _json_dumps, _load_connection_config
+
+logger = logging.getLogger(__name__)
+
+class AsyncDatabaseService:
+    """
+    asyncpg database service for IntelliAlert
+    Network waits release the event loop, so many writes can be in flight at once
+    """
+
+    def __init__(self):
+        if not ASYNCPG_AVAILABLE:
+            raise DatabaseConnectionError("asyncpg is not installed")
+        self.pool = None
+        self._pool_lock = asyncio.Lock()
+        self._loop = None
+        self._loop_thread = None
+        # Guards creating and stopping the run_sync loop, which sync callers may race on
+        self._loop_lock = threading.Lock()
+        self._load_config()
+
+    def _load_config(self):
+        """Load database configuration from environment variables"""
+        try:
+            self.config = _load_connection_config()
+        except Exception as e:
+            logger.error("Error loading database configuration: %s", e)
+            raise DatabaseConnectionError(f"Configuration error: {e}")
+
+    async def _create_pool(self):
+        """Create the asyncpg connection pool"""
+        try:
+            self.pool = await asyncpg.create_pool(
+                host=self.config['host'],
+                port=self.config['port'],
+                database=self.config['database'],
+                user=self.config['user'],
+                password=self.config['password'],
+                min_size=self.config['min_conn'],
+                max_size=self.config['max_conn'],
+                statement_cache_size=1024
+            )
+            logger.info("Async database connection pool created successfully")
+
+        except Exception as e:
+            logger.error("Error creating async connection pool: %s", e)
+            raise DatabaseConnectionError(f"Failed to create async connection pool: {e}")
+
+    async def connect(self):
+        """Create the pool if it does not exist yet; every operation calls this first"""
+        if self.pool is None:
+            async with self._pool_lock:
+                if self.pool is None:
+                    await self._create_pool()
+
+    async def test_connection(self) -> bool:
+        """Test database connection"""
+        try:
+            await self.connect()
+            async with self.pool.acquire() as conn:
+                return await conn.fetchval("SELECT 1") == 1
+        except Exception as e:
+            logger.error("Async connection test failed: %s", e)
+            return False
+
+    async def insert_metric(self, service_name: str, pod_name: str, metric_name: str,
+                            metric_value: float, incident_id: str = None, labels: Dict = None):
+        """Insert a metric data point"""
+        try:
+            await self.connect()
+            async with self.pool.acquire() as conn:
+                await conn.execute(
+                    """
+                    INSERT INTO metrics (service_name, pod_name, metric_name, metric_value, incident_id, labels)
+                    VALUES ($1, $2, $3, $4, $5, $6)
+                    """,
+                    service_name, pod_name, metric_name, metric_value, incident_id,
+                    _json_dumps(labels) if labels else None
+                )
+
+        except Exception as e:
+            logger.error("Error inserting metric: %s", e)
+            raise
+
+    async def insert_log(self, service_name: str, pod_name: str, log_level: str,
+                         message: str, incident_id: str = None, labels: Dict = None):
+        """Insert a log entry"""
+        try:
+            await self.connect()
+            async with self.pool.acquire() as conn:
+                await conn.execute(
+                    """
+                    INSERT INTO logs (service_name, pod_name, log_level, message, incident_id, labels)
+                    VALUES ($1, $2, $3, $4, $5, $6)
+                    """,
+                    service_name, pod_name, log_level, message, incident_id,
+                    _json_dumps(labels) if labels else None
+                )
+
+        except Exception as e:
+            logger.error("Error inserting log: %s", e)
+            raise
+
+    async def insert_metrics_batch(self, rows: List[tuple]):
+        """Bulk load metric rows with COPY
+
+        Each row is (service_name, pod_name, metric_name, metric_value, incident_id, labels).
+        """
+        if not rows:
+            return
+        records = [
+            (service_name, pod_name, metric_name, metric_value, incident_id, _json_dumps(labels) if labels else None)
+            for service_name, pod_name, metric_name, metric_value, incident_id, labels in rows
+        ]
+        try:
+            await self.connect()
+            async with self.pool.acquire() as conn:
+                await conn.copy_records_to_table(
+                    'metrics',
+                    records=records,
+                    columns=('service_name', 'pod_name', 'metric_name', 'metric_value', 'incident_id', 'labels')
+                )
+
+        except Exception as e:
+            logger.error("Error inserting metrics batch: %s", e)
+            raise
+
+    async def insert_logs_batch(self, rows: List[tuple]):
+        """Bulk load log rows with COPY
+
+        Each row is (service_name, pod_name, log_level, message, incident_id, labels).
+        """
+        if not rows:
+            return
+        records = [
+            (service_name, pod_name, log_level, message, incident_id, _json_dumps(labels) if labels else None)
+            for service_name, pod_name, log_level, message, incident_id, labels in rows
+        ]
+        try:
+            await self.connect()
+            async with self.pool.acquire() as conn:
+                await conn.copy_records_to_table(
+                    'logs',
+                    records=records,
+                    columns=('service_name', 'pod_name', 'log_level', 'message', 'incident_id', 'labels')
+                )
+
+        except Exception as e:
+            logger.error("Error inserting logs batch: %s", e)
+            raise
+
+    def run_sync(self, coro):
+        """Run a coroutine from synchronous code and return its result
+
+        Coroutines run on a private event loop thread so the pool stays bound to one loop,
+        e.g. ``service.run_sync(service.insert_metric(...))``; call close_sync when done.
+        """
+        loop = self._loop
+        if loop is None:
+            with self._loop_lock:
+                if self._loop is None:
+                    loop = asyncio.new_event_loop()
+                    self._loop_thread = threading.Thread(target=loop.run_forever, daemon=True)
+                    self._loop_thread.start()
+                    # Published last, so unlocked readers never see a loop without its thread
+                    self._loop = loop
+                loop = self._loop
+        return asyncio.run_coroutine_threadsafe(coro, loop).result()
+
+    def close_sync(self):
+        """Close the pool and stop the event loop thread started by run_sync"""
+        with self._loop_lock:
+            if self._loop is None:
+                return
+            loop, self._loop = self._loop, None
+            asyncio.run_coroutine_threadsafe(self.close(), loop).result()
+            loop.call_soon_threadsafe(loop.stop)
+            self._loop_thread.join()
+            self._loop_thread = None
+            loop.close()
+            # The old lock is bound to the closed loop; a later run_sync starts a new one
+            self._pool_lock = asyncio.Lock()
+
+    async def close(self):
+        """Close all connections in the pool"""
+        if self.pool:
+            await self.pool.close()
+            self.pool = None
+            logger.info("Async database connection pool closed")
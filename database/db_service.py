@@ -4,24 +4,295 @@ Handles PostgreSQL connections and operations for incident tracking
 """
 
 import os
+import time
+import struct
 import json
 import logging
+import threading
+import itertools
+import collections
 from datetime import datetime, timezone
-from typing import Optional, Dict, List, Any, Union
+from typing import Optional, Dict, List, Tuple, Iterator, Any, Union, Callable
 from contextlib import contextmanager
 import psycopg2
+import psycopg2.extensions
+import psycopg2.errors
 from psycopg2 import pool, sql
-from psycopg2.extras import RealDictCursor, Json
+from psycopg2.extras import execute_values, execute_batch
 import uuid
 
-# Set up logging
-logging.basicConfig(level=logging.INFO)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# psycopg 3 is optional; when present it drives libpq pipeline mode for composite writes
+try:
+    import psycopg
+    PSYCOPG3_AVAILABLE = True
+except ImportError:
+    psycopg = None
+    PSYCOPG3_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# Load from .env file if available, once per process rather than per service instance
+try:
+    from dotenv import load_dotenv
+    load_dotenv()
+except ImportError:
+    logger.warning("python-dotenv not installed, using system environment variables only")
+
+# Prefix for metrics/logs transactions when async commit is enabled
+_SET_ASYNC_COMMIT = "SET LOCAL synchronous_commit = off; "
+
+# Server-side prepared statements for the hot write paths, created once per backend
+_PREPARED_STATEMENTS = (
+    """
+    PREPARE ia_create_incident (uuid, varchar, varchar, severity_level, text, text[]) AS
+    INSERT INTO incidents (id, incident_type, service_name, severity, description, affected_pods)
+    VALUES ($1, $2, $3, $4, $5, $6)
+    """,
+    """
+    PREPARE ia_update_incident_status (incident_status, timestamptz, uuid) AS
+    UPDATE incidents
+    SET status = $1, end_time = $2, updated_at = NOW()
+    WHERE id = $3
+    """,
+    """
+    PREPARE ia_insert_metric (varchar, varchar, varchar, float8, uuid, jsonb) AS
+    INSERT INTO metrics (service_name, pod_name, metric_name, metric_value, incident_id, labels)
+    VALUES ($1, $2, $3, $4, $5, $6)
+    """,
+    """
+    PREPARE ia_insert_log (varchar, varchar, log_level, text, uuid, jsonb) AS
+    INSERT INTO logs (service_name, pod_name, log_level, message, incident_id, labels)
+    VALUES ($1, $2, $3, $4, $5, $6)
+    """,
+    """
+    PREPARE ia_insert_alert (varchar, varchar, severity_level, alert_status, timestamptz, timestamptz, uuid, jsonb, jsonb) AS
+    INSERT INTO alerts (alert_name, service_name, severity, status, starts_at, ends_at, incident_id, labels, annotations)
+    VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9)
+    """,
+)
+
+# SQL for the hot paths, built once at import
+_SQL_CREATE_INCIDENT = "EXECUTE ia_create_incident (%s, %s, %s, %s, %s, %s)"
+_SQL_UPDATE_INCIDENT_STATUS = "EXECUTE ia_update_incident_status (%s, %s, %s)"
+_SQL_INSERT_METRIC = "EXECUTE ia_insert_metric (%s, %s, %s, %s, %s, %s)"
+_SQL_INSERT_LOG = "EXECUTE ia_insert_log (%s, %s, %s, %s, %s, %s)"
+_SQL_INSERT_ALERT = "EXECUTE ia_insert_alert (%s, %s, %s, %s, %s, %s, %s, %s, %s)"
+
+_SQL_INSERT_METRICS_BATCH = "INSERT INTO metrics (service_name, pod_name, metric_name, metric_value, incident_id, labels) VALUES %s"
+_SQL_INSERT_METRICS_TEMPLATE = "(%s, %s, %s, %s, %s::uuid, %s::jsonb)"
+_SQL_INSERT_LOGS_BATCH = "INSERT INTO logs (service_name, pod_name, log_level, message, incident_id, labels) VALUES %s"
+_SQL_INSERT_LOGS_TEMPLATE = "(%s, %s, %s::log_level, %s, %s::uuid, %s::jsonb)"
+
+# Idle psycopg 3 pipeline connections are closed after this many seconds unused
+_PIPELINE_IDLE_TIMEOUT = 300.0
+
+# Plain statements for psycopg 3 pipelines; casts make text parameters unambiguous.
+# %b sends metric_value as a binary float8 parameter, so the server skips parsing it
+_SQL3_INSERT_METRIC = (
+    "INSERT INTO metrics (service_name, pod_name, metric_name, metric_value, incident_id, labels) "
+    "VALUES (%s, %s, %s, %b, %s::uuid, %s::jsonb)"
+)
+_SQL3_INSERT_LOG = (
+    "INSERT INTO logs (service_name, pod_name, log_level, message, incident_id, labels) "
+    "VALUES (%s, %s, %s::log_level, %s, %s::uuid, %s::jsonb)"
+)
+_SQL3_INSERT_ALERT = (
+    "INSERT INTO alerts (alert_name, service_name, severity, status, starts_at, ends_at, incident_id, labels, annotations) "
+    "VALUES (%s, %s, %s::severity_level, %s::alert_status, %s, %s, %s::uuid, %s::jsonb, %s::jsonb)"
+)
+
+# Unquoted NULL marker; every non-NULL value is written quoted, so a literal \N text loads as text
+_COPY_NULL = r'\N'
+# Metrics are loaded in the binary COPY format, so metric_value travels as raw float8
+_SQL_COPY_METRICS = (
+    "COPY metrics (service_name, pod_name, metric_name, metric_value, incident_id, labels) "
+    "FROM STDIN WITH (FORMAT binary)"
+)
+_SQL_COPY_LOGS = (
+    "COPY logs (service_name, pod_name, log_level, message, incident_id, labels) "
+    f"FROM STDIN WITH (FORMAT csv, NULL '{_COPY_NULL}')"
+)
+
 class DatabaseConnectionError(Exception):
     """Custom exception for database connection issues"""
     pass
 
+class _ServiceConnection(psycopg2.extensions.connection):
+    """Pooled connection that carries per-connection service state"""
+    
+    # Whether the prepared statements were created for this connection
+    _ia_prepared = False
+    # Cursor reused by every checkout of this connection
+    _ia_cursor = None
+    # _ConnectionCache the connection was checked out from and must go back to
+    _ia_owner = None
+
+def _load_connection_config() -> Dict:
+    """Read the connection and pool size settings shared by the sync and async services"""
+    config = {
+        'host': os.getenv('POSTGRES_HOST', 'localhost'),
+        'port': int(os.getenv('POSTGRES_PORT', 5432)),
+        'database': os.getenv('POSTGRES_DB'),
+        'user': os.getenv('POSTGRES_USER'),
+        'password': os.getenv('POSTGRES_PASSWORD'),
+        'min_conn': int(os.getenv('DB_POOL_MIN_CONN', 1)),
+        'max_conn': int(os.getenv('DB_POOL_MAX_CONN', 10))
+    }
+    
+    # Validate required configuration
+    required_fields = ['database', 'user', 'password']
+    missing_fields = [field for field in required_fields if not config.get(field)]
+    
+    if missing_fields:
+        raise DatabaseConnectionError(
+            f"Missing required environment variables: {', '.join(field.upper() for field in missing_fields)}. "
+            "Please check your .env file or environment variables."
+        )
+    return config
+
+def _json_dumps(value) -> str:
+    """Serialize a labels/annotations dict to JSON text, using orjson when installed"""
+    if orjson is not None:
+        return orjson.dumps(value).decode()
+    return json.dumps(value)
+
+def _pg_text_array(values: Optional[List[str]]) -> Optional[str]:
+    """Render a list of strings as a PostgreSQL text[] literal, skipping list adaptation"""
+    if values is None:
+        return None
+    return '{' + ','.join('"' + value.replace('\\', '\\\\').replace('"', '\\"') + '"' for value in values) + '}'
+
+def _rows_to_dicts(cursor, rows) -> List[Dict]:
+    """Build plain dicts from tuple rows using the cursor's column names"""
+    columns = [column[0] for column in cursor.description]
+    return [dict(zip(columns, row)) for row in rows]
+
+def _csv_field(value) -> str:
+    """Render one CSV field for COPY: the bare NULL marker for None, otherwise always quoted"""
+    if value is None:
+        return _COPY_NULL
+    return '"' + str(value).replace('"', '""') + '"'
+
+def _csv_line(row) -> str:
+    """Render one row as a CSV line for COPY"""
+    return ','.join([_csv_field(value) for value in row]) + '\n'
+
+# Binary COPY framing: signature, flags and header extension length, then a -1 field count
+_COPY_BINARY_HEADER = b'PGCOPY\n\xff\r\n\x00' + struct.pack('!ii', 0, 0)
+_COPY_BINARY_TRAILER = struct.pack('!h', -1)
+_COPY_BINARY_NULL = struct.pack('!i', -1)
+_COPY_METRIC_FIELDS = struct.pack('!h', 6)
+_pack_length = struct.Struct('!i').pack
+_pack_float8 = struct.Struct('!id').pack  # length word followed by the value
+_COPY_UUID_LENGTH = _pack_length(16)
+
+def _binary_text(value: Optional[str]) -> bytes:
+    """Encode a text/varchar/jsonb body as a binary COPY field"""
+    if value is None:
+        return _COPY_BINARY_NULL
+    data = value.encode()
+    return _pack_length(len(data)) + data
+
+def _binary_metric_row(row) -> bytes:
+    """Encode (service_name, pod_name, metric_name, metric_value, incident_id, labels_json) as a binary COPY tuple"""
+    service_name, pod_name, metric_name, metric_value, incident_id, labels = row
+    return b''.join((
+        _COPY_METRIC_FIELDS,
+        _binary_text(service_name),
+        _binary_text(pod_name),
+        _binary_text(metric_name),
+        _pack_float8(8, metric_value),
+        _COPY_BINARY_NULL if incident_id is None else _COPY_UUID_LENGTH + uuid.UUID(str(incident_id)).bytes,
+        # jsonb's binary form is a version byte followed by the JSON text
+        _binary_text(None if labels is None else '\x01' + labels)
+    ))
+
+class _CopyStream:
+    """
+    File-like reader over COPY data chunks (str or bytes) for cursor.copy_expert,
+    rendered on demand so bulk loads never hold the whole payload in memory
+    """
+    
+    def __init__(self, chunks, empty=''):
+        self._chunks = iter(chunks)
+        self._empty = empty
+        self._pending = empty
+    
+    def read(self, size: int = -1):
+        parts = [self._pending]
+        length = len(self._pending)
+        while size < 0 or length < size:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                break
+            parts.append(chunk)
+            length += len(chunk)
+        data = self._empty.join(parts)
+        if 0 <= size < len(data):
+            data, self._pending = data[:size], data[size:]
+        else:
+            self._pending = self._empty
+        return data
+
+class _ConnectionCache:
+    """
+    Lock-free front for a ThreadedConnectionPool
+    Idle connections are parked in a deque (append/pop/remove are atomic under the GIL)
+    and each thread remembers the connection it released last, so steady-state checkouts
+    never take the pool's lock
+    """
+    
+    def __init__(self, connection_pool: pool.ThreadedConnectionPool):
+        self.pool = connection_pool
+        self._idle = collections.deque()
+        self._local = threading.local()
+    
+    def getconn(self):
+        """Check out a connection, preferring this thread's last one"""
+        while True:
+            conn = getattr(self._local, 'conn', None)
+            self._local.conn = None
+            if conn is not None:
+                try:
+                    self._idle.remove(conn)
+                except ValueError:
+                    # Another thread picked it up in the meantime
+                    conn = None
+            if conn is None:
+                try:
+                    conn = self._idle.pop()
+                except IndexError:
+                    conn = self.pool.getconn()
+                    conn._ia_owner = self
+                    return conn
+            if not conn.closed:
+                return conn
+            self.pool.putconn(conn, close=True)
+    
+    def putconn(self, conn):
+        """Return a connection to the idle cache"""
+        if conn.closed:
+            self.pool.putconn(conn, close=True)
+            return
+        status = conn.get_transaction_status()
+        if status == psycopg2.extensions.TRANSACTION_STATUS_UNKNOWN:
+            self.pool.putconn(conn, close=True)
+            return
+        if status != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+            conn.rollback()
+        self._local.conn = conn
+        self._idle.append(conn)
+    
+    def closeall(self):
+        """Close every connection owned by the underlying pool"""
+        self._idle.clear()
+        self.pool.closeall()
+
 class DatabaseService:
     """
     PostgreSQL database service for IntelliAlert
@@ -30,174 +301,391 @@ class DatabaseService:
     
     def __init__(self):
         self.connection_pool = None
+        self.connection_pools = []
+        self._pipeline_conns = collections.deque()
+        self._tls = threading.local()
+        # Starting shard for checkouts without a routing key, advanced on every such call
+        self._unkeyed_turn = itertools.count()
         self._load_config()
+        # psycopg 3 pipeline connections in use or idle never exceed pipeline_max_conn
+        self._pipeline_slots = threading.BoundedSemaphore(self.config['pipeline_max_conn'])
+        self._ingest_prefix = _SET_ASYNC_COMMIT if self.config['async_commit'] else ""
+        self._sql_insert_metric = self._ingest_prefix + _SQL_INSERT_METRIC
+        self._sql_insert_log = self._ingest_prefix + _SQL_INSERT_LOG
         self._create_connection_pool()
     
     def _load_config(self):
         """Load database configuration from environment variables"""
         try:
-            # Load from .env file if available
-            try:
-                from dotenv import load_dotenv
-                load_dotenv()
-            except ImportError:
-                logger.warning("python-dotenv not installed, using system environment variables only")
-            
-            self.config = {
-                'host': os.getenv('POSTGRES_HOST', 'localhost'),
-                'port': int(os.getenv('POSTGRES_PORT', 5432)),
-                'database': os.getenv('POSTGRES_DB'),
-                'user': os.getenv('POSTGRES_USER'),
-                'password': os.getenv('POSTGRES_PASSWORD'),
-                'min_conn': int(os.getenv('DB_POOL_MIN_CONN', 1)),
-                'max_conn': int(os.getenv('DB_POOL_MAX_CONN', 10))
-            }
+            self.config = _load_connection_config()
+            self.config.update({
+                # Connections are spread across this many pools, keyed by service name
+                'pool_shards': max(1, int(os.getenv('DB_POOL_SHARDS', 1))),
+                # psycopg 3 pipeline connections for insert_telemetry, opened on top of DB_POOL_MAX_CONN
+                'pipeline_max_conn': max(1, int(os.getenv('DB_PIPELINE_MAX_CONN', 2))),
+                # Skip the synchronous WAL flush on metrics/logs commits; incidents stay durable
+                'async_commit': os.getenv('DB_ASYNC_COMMIT', 'true').lower() in ('1', 'true', 'yes')
+            })
             
-            # Validate required configuration
-            required_fields = ['database', 'user', 'password']
-            missing_fields = [field for field in required_fields if not self.config[field]]
-            
-            if missing_fields:
+            # Every shard needs at least one connection out of DB_POOL_MAX_CONN
+            if self.config['pool_shards'] > self.config['max_conn']:
                 raise DatabaseConnectionError(
-                    f"Missing required environment variables: {', '.join(missing_fields.upper())}. "
-                    "Please check your .env file or environment variables."
+                    f"DB_POOL_SHARDS ({self.config['pool_shards']}) cannot exceed "
+                    f"DB_POOL_MAX_CONN ({self.config['max_conn']})"
                 )
                 
         except Exception as e:
-            logger.error(f"Error loading database configuration: {e}")
+            logger.error("Error loading database configuration: %s", e)
             raise DatabaseConnectionError(f"Configuration error: {e}")
     
     def _create_connection_pool(self):
         """Create connection pool for database operations"""
         try:
-            self.connection_pool = psycopg2.pool.SimpleConnectionPool(
-                self.config['min_conn'],
-                self.config['max_conn'],
-                host=self.config['host'],
-                port=self.config['port'],
-                database=self.config['database'],
-                user=self.config['user'],
-                password=self.config['password'],
-                cursor_factory=RealDictCursor
-            )
-            logger.info("Database connection pool created successfully")
+            shards = self.config['pool_shards']
+            # Split min/max across shards, handing the remainder to the first shards,
+            # so the totals add up to exactly DB_POOL_MIN_CONN/DB_POOL_MAX_CONN
+            min_base, min_extra = divmod(self.config['min_conn'], shards)
+            max_base, max_extra = divmod(self.config['max_conn'], shards)
+            for index in range(shards):
+                threaded_pool = psycopg2.pool.ThreadedConnectionPool(
+                    min_base + (index < min_extra),
+                    max_base + (index < max_extra),
+                    host=self.config['host'],
+                    port=self.config['port'],
+                    database=self.config['database'],
+                    user=self.config['user'],
+                    password=self.config['password'],
+                    connection_factory=_ServiceConnection
+                )
+                self.connection_pools.append(_ConnectionCache(threaded_pool))
+            self.connection_pool = self.connection_pools[0]
+            logger.info("Database connection pool created successfully (%s shards)", shards)
             
         except Exception as e:
-            logger.error(f"Error creating connection pool: {e}")
+            logger.error("Error creating connection pool: %s", e)
             raise DatabaseConnectionError(f"Failed to create connection pool: {e}")
     
+    def _checkout(self, key: Optional[str]):
+        """Check out a connection from the shard for a routing key such as a service name
+
+        Calls without a key start on the shards in turn. An exhausted shard falls over
+        to the next one, so the service only fails once all DB_POOL_MAX_CONN are in use.
+        """
+        pools = self.connection_pools
+        if len(pools) == 1:
+            return pools[0].getconn()
+        start = next(self._unkeyed_turn) if key is None else hash(key)
+        error = None
+        for offset in range(len(pools)):
+            try:
+                return pools[(start + offset) % len(pools)].getconn()
+            except pool.PoolError as e:
+                error = e
+        raise error
+    
+    def _shard_batches(self, rows) -> Iterator[Tuple[Optional[str], Any]]:
+        """Split rows keyed by service name (first field) into one batch per pool shard
+
+        Yields (routing key, rows) pairs for get_connection; with a single shard the
+        rows are passed through untouched, so iterables are still streamed.
+        """
+        if len(self.connection_pools) <= 1:
+            yield None, rows
+            return
+        batches = {}
+        for row in rows:
+            index = hash(row[0]) % len(self.connection_pools)
+            if index not in batches:
+                batches[index] = (row[0], [])
+            batches[index][1].append(row)
+        yield from batches.values()
+    
     @contextmanager
-    def get_connection(self):
-        """Context manager for database connections"""
-        conn = None
+    def get_connection(self, key: Optional[str] = None):
+        """Context manager yielding a pooled connection and its cached cursor
+
+        key routes the checkout to a pool shard; threads with a bound connection ignore it.
+        """
+        # Threads that called bind_thread_connection keep reusing their own connection
+        conn = getattr(self._tls, 'conn', None)
+        bound = conn is not None or getattr(self._tls, 'bound', False)
         try:
-            conn = self.connection_pool.getconn()
+            if conn is None:
+                conn = self._checkout(key)
+                if bound:
+                    self._tls.conn = conn
             if conn:
-                yield conn
+                self._prepare_statements(conn)
+                cursor = conn._ia_cursor
+                if cursor is None or cursor.closed:
+                    cursor = conn._ia_cursor = conn.cursor()
+                yield conn, cursor
         except Exception as e:
-            if conn:
+            if conn and not conn.closed:
                 conn.rollback()
-            logger.error(f"Database connection error: {e}")
+            logger.error("Database connection error: %s", e)
             raise
         finally:
             if conn:
-                self.connection_pool.putconn(conn)
+                if not bound:
+                    conn._ia_owner.putconn(conn)
+                elif conn.closed:
+                    self._tls.conn = None
+                    conn._ia_owner.putconn(conn)
+                elif conn.get_transaction_status() != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+                    conn.rollback()
+    
+    def bind_thread_connection(self):
+        """Bind one pooled connection to the calling thread for all later operations
+
+        Meant for long-running worker loops; call release_thread_connection on shutdown.
+        """
+        self._tls.bound = True
+    
+    def release_thread_connection(self):
+        """Return the calling thread's bound connection to the pool"""
+        conn = getattr(self._tls, 'conn', None)
+        self._tls.conn = None
+        self._tls.bound = False
+        if conn:
+            conn._ia_owner.putconn(conn)
+    
+    def _prepare_statements(self, conn, retry: bool = False):
+        """Prepare the hot write statements once per connection
+
+        With retry set they are prepared again inside the caller's transaction, so they
+        reach the same backend as the statement being retried.
+        """
+        if conn._ia_prepared and not retry:
+            return
+        with conn.cursor() as cursor:
+            cursor.execute("DEALLOCATE ALL")
+            for statement in _PREPARED_STATEMENTS:
+                cursor.execute(statement)
+        if not retry:
+            conn.commit()
+        conn._ia_prepared = True
+    
+    def _execute_prepared(self, conn, execute: Callable[[], Any]):
+        """Run a statement that EXECUTEs a prepared statement, re-preparing once if it is missing
+
+        The server forgets prepared statements when the backend changes under the connection,
+        e.g. behind a transaction-pooling PgBouncer.
+        """
+        try:
+            execute()
+        except psycopg2.errors.InvalidSqlStatementName:
+            conn.rollback()
+            self._prepare_statements(conn, retry=True)
+            execute()
     
     def test_connection(self) -> bool:
         """Test database connection"""
         try:
-            with self.get_connection() as conn:
-                with conn.cursor() as cursor:
-                    cursor.execute("SELECT 1 as test")
-                    result = cursor.fetchone()
-                    if result:
-                        # Handle RealDictRow access
-                        return result['test'] == 1
-                    return False
+            with self.get_connection() as (conn, cursor):
+                cursor.execute("SELECT 1")
+                result = cursor.fetchone()
+                return result is not None and result[0] == 1
         except Exception as e:
-            logger.error(f"Connection test failed: {e}")
+            logger.error("Connection test failed: %s", e)
             return False
     
     def create_incident(self, incident_type: str, service_name: str, severity: str, 
                        description: str = None, affected_pods: List[str] = None) -> str:
         """Create a new incident and return its ID"""
         try:
-            with self.get_connection() as conn:
-                with conn.cursor() as cursor:
-                    incident_id = str(uuid.uuid4())
-                    cursor.execute(
-                        """
-                        INSERT INTO incidents (id, incident_type, service_name, severity, description, affected_pods)
-                        VALUES (%s, %s, %s, %s, %s, %s)
-                        RETURNING id
-                        """,
-                        (incident_id, incident_type, service_name, severity, description, affected_pods)
-                    )
-                    conn.commit()
-                    result = cursor.fetchone()
-                    logger.info(f"Created incident {result['id']} for service {service_name}")
-                    return str(result['id'])
-                    
+            # The ID is generated here, so there is nothing to read back from the server
+            incident_id = str(uuid.uuid4())
+            with self.get_connection(service_name) as (conn, cursor):
+                self._execute_prepared(conn, lambda: cursor.execute(
+                    _SQL_CREATE_INCIDENT,
+                    (incident_id, incident_type, service_name, severity, description, _pg_text_array(affected_pods))
+                ))
+                conn.commit()
+                logger.info("Created incident %s for service %s", incident_id, service_name)
+                return incident_id
+                
         except Exception as e:
-            logger.error(f"Error creating incident: {e}")
+            logger.error("Error creating incident: %s", e)
             raise
     
-    def update_incident_status(self, incident_id: str, status: str, end_time: datetime = None):
-        """Update incident status and optionally set end time"""
+    def update_incident_status(self, incident_id: str, status: str, end_time: datetime = None,
+                               service_name: str = None):
+        """Update incident status and optionally set end time
+
+        service_name, when given, routes the update to that service's pool shard.
+        """
         try:
-            with self.get_connection() as conn:
-                with conn.cursor() as cursor:
-                    cursor.execute(
-                        """
-                        UPDATE incidents 
-                        SET status = %s, end_time = %s, updated_at = NOW()
-                        WHERE id = %s
-                        """,
-                        (status, end_time, incident_id)
-                    )
-                    conn.commit()
-                    logger.info(f"Updated incident {incident_id} status to {status}")
-                    
+            with self.get_connection(service_name) as (conn, cursor):
+                self._execute_prepared(conn, lambda: cursor.execute(
+                    _SQL_UPDATE_INCIDENT_STATUS,
+                    (status, end_time, incident_id)
+                ))
+                conn.commit()
+                logger.info("Updated incident %s status to %s", incident_id, status)
+                
         except Exception as e:
-            logger.error(f"Error updating incident status: {e}")
+            logger.error("Error updating incident status: %s", e)
+            raise
+    
+    def update_incident_statuses(self, rows: List[Tuple[str, str, Optional[datetime]]]):
+        """Update many incidents in one transaction
+
+        Each row is (incident_id, status, end_time), as for update_incident_status.
+        """
+        if not rows:
+            return
+        try:
+            with self.get_connection() as (conn, cursor):
+                self._execute_prepared(conn, lambda: execute_batch(
+                    cursor,
+                    _SQL_UPDATE_INCIDENT_STATUS,
+                    [(status, end_time, incident_id) for incident_id, status, end_time in rows],
+                    page_size=200
+                ))
+                conn.commit()
+                logger.info("Updated status of %s incidents", len(rows))
+                
+        except Exception as e:
+            logger.error("Error updating incident statuses: %s", e)
             raise
     
     def insert_metric(self, service_name: str, pod_name: str, metric_name: str, 
                      metric_value: float, incident_id: str = None, labels: Dict = None):
         """Insert a metric data point"""
         try:
-            with self.get_connection() as conn:
-                with conn.cursor() as cursor:
-                    cursor.execute(
-                        """
-                        INSERT INTO metrics (service_name, pod_name, metric_name, metric_value, incident_id, labels)
-                        VALUES (%s, %s, %s, %s, %s, %s)
-                        """,
-                        (service_name, pod_name, metric_name, metric_value, incident_id, Json(labels) if labels else None)
-                    )
-                    conn.commit()
-                    
+            with self.get_connection(service_name) as (conn, cursor):
+                self._execute_prepared(conn, lambda: cursor.execute(
+                    self._sql_insert_metric,
+                    (service_name, pod_name, metric_name, metric_value, incident_id, _json_dumps(labels) if labels else None)
+                ))
+                conn.commit()
+                
         except Exception as e:
-            logger.error(f"Error inserting metric: {e}")
+            logger.error("Error inserting metric: %s", e)
             raise
     
     def insert_log(self, service_name: str, pod_name: str, log_level: str, 
                    message: str, incident_id: str = None, labels: Dict = None):
         """Insert a log entry"""
         try:
-            with self.get_connection() as conn:
-                with conn.cursor() as cursor:
-                    cursor.execute(
-                        """
-                        INSERT INTO logs (service_name, pod_name, log_level, message, incident_id, labels)
-                        VALUES (%s, %s, %s, %s, %s, %s)
-                        """,
-                        (service_name, pod_name, log_level, message, incident_id, Json(labels) if labels else None)
+            with self.get_connection(service_name) as (conn, cursor):
+                self._execute_prepared(conn, lambda: cursor.execute(
+                    self._sql_insert_log,
+                    (service_name, pod_name, log_level, message, incident_id, _json_dumps(labels) if labels else None)
+                ))
+                conn.commit()
+                
+        except Exception as e:
+            logger.error("Error inserting log: %s", e)
+            raise
+    
+    def insert_metrics_batch(self, rows: List[tuple]):
+        """Insert many metric data points in a single statement and transaction per pool shard
+
+        Each row is (service_name, pod_name, metric_name, metric_value, incident_id, labels).
+        """
+        if not rows:
+            return
+        try:
+            for key, shard_rows in self._shard_batches(rows):
+                values = [
+                    (service_name, pod_name, metric_name, metric_value, incident_id, _json_dumps(labels) if labels else None)
+                    for service_name, pod_name, metric_name, metric_value, incident_id, labels in shard_rows
+                ]
+                with self.get_connection(key) as (conn, cursor):
+                    if self._ingest_prefix:
+                        cursor.execute(self._ingest_prefix)
+                    execute_values(
+                        cursor,
+                        _SQL_INSERT_METRICS_BATCH,
+                        values,
+                        template=_SQL_INSERT_METRICS_TEMPLATE,
+                        page_size=500
+                    )
+                    conn.commit()
+                
+        except Exception as e:
+            logger.error("Error inserting metrics batch: %s", e)
+            raise
+    
+    def insert_logs_batch(self, rows: List[tuple]):
+        """Insert many log entries in a single statement and transaction per pool shard
+
+        Each row is (service_name, pod_name, log_level, message, incident_id, labels).
+        """
+        if not rows:
+            return
+        try:
+            for key, shard_rows in self._shard_batches(rows):
+                values = [
+                    (service_name, pod_name, log_level, message, incident_id, _json_dumps(labels) if labels else None)
+                    for service_name, pod_name, log_level, message, incident_id, labels in shard_rows
+                ]
+                with self.get_connection(key) as (conn, cursor):
+                    if self._ingest_prefix:
+                        cursor.execute(self._ingest_prefix)
+                    execute_values(
+                        cursor,
+                        _SQL_INSERT_LOGS_BATCH,
+                        values,
+                        template=_SQL_INSERT_LOGS_TEMPLATE,
+                        page_size=500
                     )
                     conn.commit()
-                    
+                
+        except Exception as e:
+            logger.error("Error inserting logs batch: %s", e)
+            raise
+    
+    def copy_metrics(self, rows_iter):
+        """Bulk load metric data points with COPY FROM STDIN
+
+        Rows are (service_name, pod_name, metric_name, metric_value, incident_id, labels)
+        and may come from any iterable; they are streamed to the server in the binary COPY
+        format, one COPY per pool shard.
+        """
+        try:
+            for key, shard_rows in self._shard_batches(rows_iter):
+                rows = (
+                    _binary_metric_row((service_name, pod_name, metric_name, float(metric_value), incident_id,
+                                        _json_dumps(labels) if labels else None))
+                    for service_name, pod_name, metric_name, metric_value, incident_id, labels in shard_rows
+                )
+                with self.get_connection(key) as (conn, cursor):
+                    if self._ingest_prefix:
+                        cursor.execute(self._ingest_prefix)
+                    cursor.copy_expert(
+                        _SQL_COPY_METRICS,
+                        _CopyStream(itertools.chain((_COPY_BINARY_HEADER,), rows, (_COPY_BINARY_TRAILER,)), b'')
+                    )
+                    conn.commit()
+                
+        except Exception as e:
+            logger.error("Error copying metrics: %s", e)
+            raise
+    
+    def copy_logs(self, rows_iter):
+        """Bulk load log entries with COPY FROM STDIN
+
+        Rows are (service_name, pod_name, log_level, message, incident_id, labels)
+        and may come from any iterable; they are streamed to the server as CSV, one COPY
+        per pool shard.
+        """
+        try:
+            for key, shard_rows in self._shard_batches(rows_iter):
+                rows = (
+                    (service_name, pod_name, log_level, message, incident_id, _json_dumps(labels) if labels else None)
+                    for service_name, pod_name, log_level, message, incident_id, labels in shard_rows
+                )
+                with self.get_connection(key) as (conn, cursor):
+                    if self._ingest_prefix:
+                        cursor.execute(self._ingest_prefix)
+                    cursor.copy_expert(_SQL_COPY_LOGS, _CopyStream(map(_csv_line, rows)))
+                    conn.commit()
+                
         except Exception as e:
-            logger.error(f"Error inserting log: {e}")
+            logger.error("Error copying logs: %s", e)
             raise
     
     def insert_alert(self, alert_name: str, service_name: str, severity: str, 
@@ -205,85 +693,217 @@ class DatabaseService:
                     incident_id: str = None, labels: Dict = None, annotations: Dict = None):
         """Insert an alert"""
         try:
-            with self.get_connection() as conn:
-                with conn.cursor() as cursor:
-                    cursor.execute(
-                        """
-                        INSERT INTO alerts (alert_name, service_name, severity, status, starts_at, ends_at, incident_id, labels, annotations)
-                        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-                        """,
-                        (alert_name, service_name, severity, status, starts_at, ends_at, incident_id, 
-                         Json(labels) if labels else None, Json(annotations) if annotations else None)
-                    )
-                    conn.commit()
-                    
+            with self.get_connection(service_name) as (conn, cursor):
+                self._execute_prepared(conn, lambda: cursor.execute(
+                    _SQL_INSERT_ALERT,
+                    (alert_name, service_name, severity, status, starts_at, ends_at, incident_id, 
+                     _json_dumps(labels) if labels else None, _json_dumps(annotations) if annotations else None)
+                ))
+                conn.commit()
+                
         except Exception as e:
-            logger.error(f"Error inserting alert: {e}")
+            logger.error("Error inserting alert: %s", e)
             raise
     
-    def get_active_incidents(self) -> List[Dict]:
-        """Get all active incidents"""
+    def _iter_query(self, query: str, params: tuple = None) -> Iterator[Dict]:
+        """Run a SELECT on a server-side cursor and yield rows as dicts
+
+        Threads with a bound connection fetch everything up front instead: a commit made
+        on that connection while iterating would close the cursor and cut the stream short.
+        """
+        if getattr(self._tls, 'bound', False):
+            with self.get_connection() as (conn, cursor):
+                cursor.execute(query, params)
+                rows = _rows_to_dicts(cursor, cursor.fetchall())
+            yield from rows
+            return
+        with self.get_connection() as (conn, _):
+            with conn.cursor(name=f"stream_{uuid.uuid4().hex}") as cursor:
+                cursor.itersize = 1000
+                cursor.execute(query, params)
+                columns = None
+                for row in cursor:
+                    if columns is None:
+                        columns = [column[0] for column in cursor.description]
+                    yield dict(zip(columns, row))
+    
+    def _stream_query(self, query: str, params: tuple = None, action: str = "executing query") -> Iterator[Dict]:
+        """Stream a SELECT's rows as dicts
+
+        A failure before the first row is logged and yields nothing, as the old fetchall
+        paths returned []; a failure after rows were yielded is re-raised so callers never
+        get a silently truncated result.
+        """
+        started = False
         try:
-            with self.get_connection() as conn:
-                with conn.cursor() as cursor:
-                    cursor.execute("SELECT * FROM get_active_incidents()")
-                    return [dict(row) for row in cursor.fetchall()]
-                    
+            for row in self._iter_query(query, params):
+                started = True
+                yield row
+                
         except Exception as e:
-            logger.error(f"Error getting active incidents: {e}")
-            return []
+            logger.error("Error %s: %s", action, e)
+            if started:
+                raise
+    
+    def get_active_incidents(self) -> Iterator[Dict]:
+        """Get all active incidents, streamed lazily"""
+        return self._stream_query("SELECT * FROM get_active_incidents()", action="getting active incidents")
     
     def get_incident_summary(self, incident_id: str) -> Dict:
         """Get comprehensive incident summary"""
         try:
-            with self.get_connection() as conn:
-                with conn.cursor() as cursor:
-                    cursor.execute("SELECT * FROM get_incident_summary(%s)", (incident_id,))
-                    result = cursor.fetchone()
-                    return dict(result) if result else {}
-                    
+            with self.get_connection() as (conn, cursor):
+                cursor.execute("SELECT * FROM get_incident_summary(%s)", (incident_id,))
+                result = cursor.fetchone()
+                return _rows_to_dicts(cursor, [result])[0] if result else {}
+                
         except Exception as e:
-            logger.error(f"Error getting incident summary: {e}")
+            logger.error("Error getting incident summary: %s", e)
             return {}
     
-    def get_service_health(self) -> List[Dict]:
-        """Get service health summary"""
+    def get_service_health(self) -> Iterator[Dict]:
+        """Get service health summary, streamed lazily"""
+        return self._stream_query("SELECT * FROM service_health_summary", action="getting service health")
+    
+    def execute_query(self, query: str, params: tuple = None) -> List[Dict]:
+        """Execute a custom query and return results
+
+        Runs on a plain cursor, so any statement that returns rows works (SHOW, EXPLAIN,
+        INSERT ... RETURNING); statements without a result give [].
+        """
         try:
-            with self.get_connection() as conn:
-                with conn.cursor() as cursor:
-                    cursor.execute("SELECT * FROM service_health_summary")
-                    return [dict(row) for row in cursor.fetchall()]
-                    
+            with self.get_connection() as (conn, cursor):
+                cursor.execute(query, params)
+                if cursor.description is None:
+                    return []
+                return _rows_to_dicts(cursor, cursor.fetchall())
+                
         except Exception as e:
-            logger.error(f"Error getting service health: {e}")
+            logger.error("Error executing query: %s", e)
             return []
     
-    def execute_query(self, query: str, params: tuple = None) -> List[Dict]:
-        """Execute a custom query and return results"""
+    def insert_telemetry(self, metrics: List[tuple] = (), logs: List[tuple] = (), alerts: List[tuple] = ()):
+        """Write related metric, log and alert rows in one transaction and round trip
+
+        Rows follow the argument order of insert_metric, insert_log and insert_alert.
+        With psycopg 3 installed the statements are streamed in pipeline mode; otherwise
+        they are sent to psycopg2 as a single multi-statement query.
+        """
+        # float() so the binary metric_value parameter is always dumped as float8
+        metric_rows = [
+            row[:3] + (float(row[3]), row[4], _json_dumps(row[5]) if row[5] else None)
+            for row in metrics
+        ]
+        log_rows = [row[:5] + (_json_dumps(row[5]) if row[5] else None,) for row in logs]
+        alert_rows = [
+            row[:7] + (_json_dumps(row[7]) if row[7] else None, _json_dumps(row[8]) if row[8] else None)
+            for row in alerts
+        ]
+        if not (metric_rows or log_rows or alert_rows):
+            return
         try:
-            with self.get_connection() as conn:
-                with conn.cursor() as cursor:
-                    cursor.execute(query, params)
-                    return [dict(row) for row in cursor.fetchall()]
-                    
+            if PSYCOPG3_AVAILABLE:
+                self._insert_telemetry_pipelined(metric_rows, log_rows, alert_rows)
+                return
+            with self.get_connection() as (conn, cursor):
+                statements = [cursor.mogrify(_SQL_INSERT_METRIC, row) for row in metric_rows]
+                statements += [cursor.mogrify(_SQL_INSERT_LOG, row) for row in log_rows]
+                statements += [cursor.mogrify(_SQL_INSERT_ALERT, row) for row in alert_rows]
+                self._execute_prepared(conn, lambda: cursor.execute(b"; ".join(statements)))
+                conn.commit()
+                
         except Exception as e:
-            logger.error(f"Error executing query: {e}")
-            return []
+            logger.error("Error inserting telemetry: %s", e)
+            raise
+    
+    def _pipeline_connection(self) -> Tuple[Any, bool]:
+        """Check out an idle psycopg 3 connection, or open one; returns (conn, reused)"""
+        # Oldest idle connections sit on the left; close those unused for too long
+        expired = time.monotonic() - _PIPELINE_IDLE_TIMEOUT
+        while True:
+            # Other pipeline threads may empty the deque at any point, so every access is guarded
+            try:
+                if self._pipeline_conns[0][1] >= expired:
+                    break
+                conn, _ = self._pipeline_conns.popleft()
+            except IndexError:
+                break
+            conn.close()
+        while self._pipeline_conns:
+            try:
+                conn, _ = self._pipeline_conns.pop()
+            except IndexError:
+                break
+            if not (conn.closed or conn.broken):
+                return conn, True
+            conn.close()
+        conn = psycopg.connect(
+            host=self.config['host'],
+            port=self.config['port'],
+            dbname=self.config['database'],
+            user=self.config['user'],
+            password=self.config['password']
+        )
+        return conn, False
+    
+    def _insert_telemetry_pipelined(self, metric_rows: List[tuple], log_rows: List[tuple], alert_rows: List[tuple]):
+        """Send the composite write through a psycopg 3 pipeline
+
+        At most DB_PIPELINE_MAX_CONN pipelines run at once, so no more than that many
+        connections are opened besides the psycopg2 pools. A reused connection the
+        server dropped while idle is replaced and the write retried once.
+        """
+        with self._pipeline_slots:
+            conn, reused = self._pipeline_connection()
+            try:
+                self._run_pipeline(conn, metric_rows, log_rows, alert_rows)
+            except psycopg.OperationalError as e:
+                conn.close()
+                if not reused:
+                    raise
+                logger.warning("Pipeline connection lost, retrying on a new connection: %s", e)
+                conn, _ = self._pipeline_connection()
+                try:
+                    self._run_pipeline(conn, metric_rows, log_rows, alert_rows)
+                except Exception:
+                    conn.close()
+                    raise
+            except Exception:
+                conn.close()
+                raise
+            self._pipeline_conns.append((conn, time.monotonic()))
+    
+    def _run_pipeline(self, conn, metric_rows: List[tuple], log_rows: List[tuple], alert_rows: List[tuple]):
+        """Execute and commit the composite write on one psycopg 3 connection"""
+        with conn.pipeline(), conn.cursor() as cursor:
+            for sql_text, rows in ((_SQL3_INSERT_METRIC, metric_rows),
+                                   (_SQL3_INSERT_LOG, log_rows),
+                                   (_SQL3_INSERT_ALERT, alert_rows)):
+                if rows:
+                    cursor.executemany(sql_text, rows)
+        conn.commit()
     
     def close(self):
         """Close all connections in the pool"""
-        if self.connection_pool:
-            self.connection_pool.closeall()
+        while self._pipeline_conns:
+            self._pipeline_conns.pop()[0].close()
+        if self.connection_pools:
+            for connection_pool in self.connection_pools:
+                connection_pool.closeall()
             logger.info("Database connection pool closed")
 
 # Global database service instance
 db_service = None
+_db_service_lock = threading.Lock()
 
 def get_db_service() -> DatabaseService:
     """Get or create database service instance"""
     global db_service
     if db_service is None:
-        db_service = DatabaseService()
+        # Double-checked so concurrent first callers share one service and pool
+        with _db_service_lock:
+            if db_service is None:
+                db_service = DatabaseService()
     return db_service
 
 def initialize_database():
@@ -297,11 +917,13 @@ def initialize_database():
             logger.error("Database connection test failed")
             return False
     except Exception as e:
-        logger.error(f"Failed to initialize database service: {e}")
+        logger.error("Failed to initialize database service: %s", e)
         return False
 
 # Example usage and testing
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    
     # Test the database service
     try:
         print("Testing database service...")
@@ -343,7 +965,7 @@ if __name__ == "__main__":
             print("Inserted test log")
             
             # Get active incidents
-            incidents = service.get_active_incidents()
+            incidents = list(service.get_active_incidents())
             print(f"Found {len(incidents)} active incidents")
             
             # Clean up test incident
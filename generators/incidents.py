@@ -1,14 +1,17 @@
 from prometheus_client import start_http_server, Gauge, Counter, Histogram
-import requests, time, random, datetime, threading
+import requests, time, random, datetime, threading, queue
+from concurrent.futures import ThreadPoolExecutor, wait
+from requests.adapters import HTTPAdapter
+from collections import defaultdict
 from enum import Enum
 from dataclasses import dataclass, field
-from typing import List, Dict, Optional
+from typing import Callable, List, Dict, Optional
 import json
-import sys
-import os
+import bisect
+import logging
+import orjson
+import numpy as np
 
-# Add parent directory to path for database imports
-sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 from database.db_service import get_db_service, initialize_database
 
 # Enhanced Metrics
@@ -18,14 +21,35 @@ disk_usage = Gauge("service_disk_usage", "Disk usage percentage", ["service", "p
 network_latency = Gauge("service_network_latency_ms", "Network latency in milliseconds", ["service", "target"])
 request_rate = Gauge("service_request_rate", "Requests per second", ["service", "endpoint"])
 error_rate = Gauge("service_error_rate", "Error rate percentage", ["service", "error_type"])
-response_time = Histogram("service_response_time_seconds", "Response time in seconds", ["service", "endpoint"])
+# Buckets bracket the 2s/3s/5s p95 thresholds in prometheus/alert_rules.yml and the 1-15s range observed
+response_time = Histogram("service_response_time_seconds", "Response time in seconds", ["service", "endpoint"],
+                          buckets=(0.5, 1.0, 2.0, 3.0, 5.0, 10.0, 15.0))
 database_connections = Gauge("service_db_connections", "Active database connections", ["service", "db_name"])
 queue_depth = Gauge("service_queue_depth", "Message queue depth", ["service", "queue_name"])
 gc_time = Gauge("service_gc_time_ms", "Garbage collection time in milliseconds", ["service", "gc_type"])
+io_dropped = Counter("generator_io_dropped", "Telemetry items dropped because the I/O queue was full", ["kind"])
 
 # Loki endpoint (updated for local execution)
 LOKI_URL = "http://localhost:3100/loki/api/v1/push"
 
+# Keep-alive session shared by all Loki pushes
+_LOKI_SESSION = requests.Session()
+_LOKI_SESSION.mount("http://", HTTPAdapter(pool_connections=2, pool_maxsize=4, max_retries=0))
+_LOKI_HEADERS = {"Content-Type": "application/json"}
+
+# Background I/O queue limits
+IO_QUEUE_SIZE = 10000
+IO_BATCH_SIZE = 1000
+IO_BATCH_WINDOW = 0.05  # seconds to keep draining after the first item
+IO_SHUTDOWN_TIMEOUT = 30.0  # seconds to wait for queued writes on shutdown
+_IO_STOP = object()  # queued after the last tick's items to stop the I/O worker
+
+TICK_INTERVAL = 10.0  # seconds between generation ticks
+
+# Normal-operation jitter bounds for (cpu, memory, connections); high is exclusive
+NORMAL_JITTER_LOW = (-5, -5, -5)
+NORMAL_JITTER_HIGH = (11, 11, 6)
+
 class IncidentType(Enum):
     NORMAL = "normal"
     MEMORY_LEAK = "memory_leak"
@@ -38,7 +62,7 @@ class IncidentType(Enum):
     GC_PRESSURE = "gc_pressure"
     ERROR_BURST = "error_burst"
 
-@dataclass
+@dataclass(slots=True)
 class Service:
     name: str
     service_type: str
@@ -48,6 +72,7 @@ class Service:
     pods: List[str] = field(default_factory=list)
     current_incident: Optional[IncidentType] = None
     incident_start_time: Optional[datetime.datetime] = None
+    incident_start_mono: float = 0.0  # time.monotonic() at incident start
     incident_duration: int = 0
     current_incident_id: Optional[str] = None  # Database incident ID
 
@@ -62,64 +87,193 @@ SERVICES = [
     Service("message-queue", "queue", base_cpu=20, base_memory=35, pods=["mq-1"]),
 ]
 
+# Incident patterns: how long each type lasts, how likely it is per tick, and where it occurs
+INCIDENT_PATTERNS = {
+    IncidentType.MEMORY_LEAK: {
+        "duration_range": (120, 600),  # 2-10 minutes
+        "probability": 0.15,
+        "services": ["user-api", "payment-service", "order-processor"]
+    },
+    IncidentType.CPU_SPIKE: {
+        "duration_range": (60, 300),   # 1-5 minutes
+        "probability": 0.20,
+        "services": ["user-api", "payment-service", "search-engine"]
+    },
+    IncidentType.DATABASE_SLOW: {
+        "duration_range": (90, 450),   # 1.5-7.5 minutes
+        "probability": 0.12,
+        "services": ["user-db"]
+    },
+    IncidentType.NETWORK_LATENCY: {
+        "duration_range": (60, 240),   # 1-4 minutes
+        "probability": 0.18,
+        "services": ["user-api", "payment-service"]
+    },
+    IncidentType.DISK_FULL: {
+        "duration_range": (180, 900),  # 3-15 minutes
+        "probability": 0.08,
+        "services": ["user-db", "search-engine"]
+    },
+    IncidentType.CONNECTION_LEAK: {
+        "duration_range": (120, 480),  # 2-8 minutes
+        "probability": 0.10,
+        "services": ["user-api", "payment-service", "user-db"]
+    },
+    IncidentType.QUEUE_BACKLOG: {
+        "duration_range": (90, 360),   # 1.5-6 minutes
+        "probability": 0.14,
+        "services": ["message-queue", "order-processor"]
+    },
+    IncidentType.GC_PRESSURE: {
+        "duration_range": (90, 420),   # 1.5-7 minutes
+        "probability": 0.16,
+        "services": ["user-api", "payment-service", "search-engine"]
+    },
+    IncidentType.ERROR_BURST: {
+        "duration_range": (30, 180),   # 0.5-3 minutes
+        "probability": 0.22,
+        "services": ["user-api", "payment-service", "order-processor"]
+    }
+}
+
+# Severity recorded with each incident type in the database
+SEVERITY_MAP = {
+    IncidentType.MEMORY_LEAK: "high",
+    IncidentType.CPU_SPIKE: "high",
+    IncidentType.DATABASE_SLOW: "critical",
+    IncidentType.NETWORK_LATENCY: "medium",
+    IncidentType.DISK_FULL: "critical",
+    IncidentType.CONNECTION_LEAK: "high",
+    IncidentType.QUEUE_BACKLOG: "medium",
+    IncidentType.GC_PRESSURE: "medium",
+    IncidentType.ERROR_BURST: "high"
+}
+
+# Log messages picked at random during error bursts and normal operation
+ERROR_BURST_MESSAGES = (
+    "HTTP 400 Bad Request: Invalid user ID format",
+    "HTTP 404 Not Found: User profile not found",
+    "HTTP 429 Too Many Requests: Rate limit exceeded",
+    "HTTP 503 Service Unavailable: Downstream service error"
+)
+NORMAL_MESSAGES = (
+    "Health check completed successfully",
+    "Processed requests in last minute",
+    "Service startup completed",
+    "Configuration reloaded"
+)
+
+# Per service: the incident types that can hit it, in pattern order, as
+# (incident_type, probability, duration_range)
+PATTERNS_BY_SERVICE = {
+    service.name: [
+        (incident_type, config["probability"], config["duration_range"])
+        for incident_type, config in INCIDENT_PATTERNS.items()
+        if service.name in config["services"]
+    ]
+    for service in SERVICES
+}
+
+def _logfmt(fields: Optional[Dict]) -> str:
+    """Render structured log fields as a logfmt suffix for the Loki line"""
+    if not fields:
+        return ""
+    return "".join(f" {key}={value}" for key, value in fields.items())
+
+class _LabelCache(dict):
+    """Label-values tuple -> metric child, resolving each child once on first use"""
+    
+    def __init__(self, metric):
+        super().__init__()
+        self.metric = metric
+    
+    def __missing__(self, label_values):
+        child = self[label_values] = self.metric.labels(*label_values)
+        return child
+
+class _ObserveCache(_LabelCache):
+    """Label-values tuple -> bound Histogram observe, resolved once on first use"""
+    
+    def __missing__(self, label_values):
+        observe = self[label_values] = self.metric.labels(*label_values).observe
+        return observe
+
 class IncidentGenerator:
     def __init__(self):
         self.active_incidents = {}
         self.total_incidents_generated = 0
+        self.active_incident_count = 0  # services with current_incident set
         self.max_concurrent_incidents = 3
         self.generation_start_time = datetime.datetime.now()
+        self.generation_start_mono = time.monotonic()
+        self._rng = np.random.default_rng()
+        
+        # Per service: cumulative start probabilities and the matching incident types.
+        # Type i only started if every earlier type's check failed, so its share is
+        # p_i * prod(1 - p_j) for j < i; one uniform draw then picks at most one type.
+        self._cum_by_service = {}
+        for service_name, candidates in PATTERNS_BY_SERVICE.items():
+            cumulative = []
+            total = 0.0
+            none_so_far = 1.0
+            for _, probability, _ in candidates:
+                total += probability * none_so_far
+                none_so_far *= 1.0 - probability
+                cumulative.append(total)
+            self._cum_by_service[service_name] = (
+                tuple(cumulative), tuple(incident_type for incident_type, _, _ in candidates)
+            )
+        
+        # Prometheus children keyed by label values, so hot paths skip labels() lookups
+        self._cpu = _LabelCache(cpu_usage)
+        self._mem = _LabelCache(memory_usage)
+        self._disk = _LabelCache(disk_usage)
+        self._net_latency = _LabelCache(network_latency)
+        self._errors = _LabelCache(error_rate)
+        self._rt_observe = _ObserveCache(response_time)
+        self._db_conn = _LabelCache(database_connections)
+        self._queue = _LabelCache(queue_depth)
+        self._gc = _LabelCache(gc_time)
+        # CPU/memory are exported for every pod from the first tick, so warm them now;
+        # the rest stay lazy so no zero-valued series appear for unused label sets
+        for service in SERVICES:
+            for pod in service.pods:
+                self._cpu[service.name, pod]
+                self._mem[service.name, pod]
+        
+        # One shared, read-only {"pod": ...} label dict per pod for push_log
+        self._pod_labels = {pod: {"pod": pod} for service in SERVICES for pod in service.pods}
+        
+        # Log lines buffered per Loki stream until the end of the tick
+        self._log_buffer = defaultdict(list)
+        # DB rows buffered until the end of the tick
+        self._pending_metrics: List[tuple] = []
+        self._pending_logs: List[tuple] = []
+        # Metrics are persisted on 1 tick in _sample_every (about once a minute)
+        self._sample_every = 6
+        self._tick_counter = 0
+        # Per service: the latest incident row per (pod, metric) that sampling skipped,
+        # written out when the incident ends so it always closes with a stored sample
+        self._incident_tail: Dict[str, Dict[tuple, tuple]] = {service.name: {} for service in SERVICES}
+        # Loki timestamp and rendered log time, refreshed once per tick by the main loop
+        self._tick_ts_ns = time.time_ns()
+        self._tick_ts_str = datetime.datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S")
         
         # Initialize database service
         self.db_service = None
         self.db_enabled = self._initialize_database()
         
-        self.incident_patterns = {
-            IncidentType.MEMORY_LEAK: {
-                "duration_range": (120, 600),  # 2-10 minutes
-                "probability": 0.15,
-                "services": ["user-api", "payment-service", "order-processor"]
-            },
-            IncidentType.CPU_SPIKE: {
-                "duration_range": (60, 300),   # 1-5 minutes
-                "probability": 0.20,
-                "services": ["user-api", "payment-service", "search-engine"]
-            },
-            IncidentType.DATABASE_SLOW: {
-                "duration_range": (90, 450),   # 1.5-7.5 minutes
-                "probability": 0.12,
-                "services": ["user-db"]
-            },
-            IncidentType.NETWORK_LATENCY: {
-                "duration_range": (60, 240),   # 1-4 minutes
-                "probability": 0.18,
-                "services": ["user-api", "payment-service"]
-            },
-            IncidentType.DISK_FULL: {
-                "duration_range": (180, 900),  # 3-15 minutes
-                "probability": 0.08,
-                "services": ["user-db", "search-engine"]
-            },
-            IncidentType.CONNECTION_LEAK: {
-                "duration_range": (120, 480),  # 2-8 minutes
-                "probability": 0.10,
-                "services": ["user-api", "payment-service", "user-db"]
-            },
-            IncidentType.QUEUE_BACKLOG: {
-                "duration_range": (90, 360),   # 1.5-6 minutes
-                "probability": 0.14,
-                "services": ["message-queue", "order-processor"]
-            },
-            IncidentType.GC_PRESSURE: {
-                "duration_range": (90, 420),   # 1.5-7 minutes
-                "probability": 0.16,
-                "services": ["user-api", "payment-service", "search-engine"]
-            },
-            IncidentType.ERROR_BURST: {
-                "duration_range": (30, 180),   # 0.5-3 minutes
-                "probability": 0.22,
-                "services": ["user-api", "payment-service", "order-processor"]
-            }
-        }
+        # Loki pushes and DB writes run on a background thread fed by a bounded queue
+        self._io_q = queue.Queue(maxsize=IO_QUEUE_SIZE)
+        self._io_thread = threading.Thread(target=self._io_worker, name="io-worker", daemon=True)
+        self._io_thread.start()
+        
+        # Services are processed concurrently each tick; the lock guards the shared
+        # incident bookkeeping (concurrency limit, active/total counters)
+        self._pool = ThreadPoolExecutor(max_workers=len(SERVICES), thread_name_prefix="svc")
+        self._incident_lock = threading.Lock()
+        
+        self.incident_patterns = INCIDENT_PATTERNS
     
     def _initialize_database(self):
         """Initialize database connection"""
@@ -136,62 +290,160 @@ class IncidentGenerator:
             print("Continuing without database integration")
             return False
 
-    def push_log(self, service, level, message, labels=None, incident_id=None):
-        """Enhanced log pushing with better formatting and labels"""
-        ts = str(int(time.time() * 1e9))
-        timestamp = datetime.datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S")
+    def push_log(self, service, level, message, labels=None, incident_id=None, fields=None):
+        """Enhanced log pushing with better formatting and labels
+        
+        message is a fixed string; per-event values go in fields, which are stored with
+        the DB labels and rendered into the Loki line by the I/O worker. Fields never
+        become Loki stream labels, so stream cardinality stays bounded.
+        """
+        # Shared per tick; set by the main loop
+        timestamp = self._tick_ts_str
         
         stream_labels = {"service": service, "level": level}
         if labels:
             stream_labels.update(labels)
-            
-        payload = {
-            "streams": [
-                {
-                    "stream": stream_labels,
-                    "values": [[ts, f"{timestamp} {level.upper()} [{service}] {message}"]],
-                }
-            ]
-        }
-        
-        # Push to Loki
-        try:
-            requests.post(LOKI_URL, json=payload, timeout=2)
-        except Exception as e:
-            print(f"Failed to push log to Loki: {e}")
+        
+        # Buffered for Loki; rendered by the I/O worker after flush_logs. Loki drops entries
+        # with the same timestamp and line within a stream, so each entry is offset from the
+        # tick's base by its position in the stream's buffer (which is reset every tick)
+        entries = self._log_buffer[frozenset(stream_labels.items())]
+        ts = str(self._tick_ts_ns + len(entries))
+        entries.append((ts, timestamp, message, fields))
         
         # Store in database
         if self.db_enabled and self.db_service:
-            try:
-                pod_name = labels.get('pod') if labels else None
-                self.db_service.insert_log(
-                    service_name=service,
-                    pod_name=pod_name,
-                    log_level=level.upper(),
-                    message=message,
-                    incident_id=incident_id,
-                    labels=labels
-                )
-            except Exception as e:
-                print(f"Failed to store log in database: {e}")
+            pod_name = labels.get('pod') if labels else None
+            if fields:
+                labels = {**labels, **fields} if labels else fields
+            self._pending_logs.append((service, pod_name, level.upper(), message, incident_id, labels))
+    
+    def flush_logs(self):
+        """Hand all buffered log lines to the I/O worker as a single Loki push"""
+        if not self._log_buffer:
+            return
+        buffer, self._log_buffer = self._log_buffer, defaultdict(list)
+        self._enqueue_io("loki", buffer)
     
     def store_metric(self, service_name: str, pod_name: str, metric_name: str, 
-                    metric_value: float, incident_id: str = None, labels: Dict = None):
-        """Store metric data in database"""
-        if self.db_enabled and self.db_service:
-            try:
-                self.db_service.insert_metric(
-                    service_name=service_name,
-                    pod_name=pod_name,
-                    metric_name=metric_name,
-                    metric_value=metric_value,
-                    incident_id=incident_id,
-                    labels=labels
-                )
-            except Exception as e:
-                print(f"Failed to store metric in database: {e}")
+                    metric_value: float, incident_id: str = None, labels: Dict = None,
+                    force: bool = False):
+        """Store metric data in database
+        
+        Prometheus already keeps the full gauge series, so only every _sample_every-th
+        tick is persisted unless force is set (e.g. an incident's first sample). The last
+        skipped incident sample per series is held back for _flush_incident_tail.
+        """
+        if not (self.db_enabled and self.db_service):
+            return
+        row = (service_name, pod_name, metric_name, metric_value, incident_id, labels)
+        tail = self._incident_tail[service_name]
+        if force or not self._tick_counter % self._sample_every:
+            self._pending_metrics.append(row)
+            if incident_id is not None:
+                tail.pop((pod_name, metric_name), None)
+        elif incident_id is not None:
+            tail[pod_name, metric_name] = row
+    
+    def _flush_incident_tail(self, service: Service):
+        """Queue the incident's held-back final samples for this tick's DB flush"""
+        tail = self._incident_tail[service.name]
+        if tail:
+            self._pending_metrics.extend(tail.values())
+            tail.clear()
+    
+    def flush_db(self):
+        """Hand this tick's metric and log rows to the I/O worker for bulk loading"""
+        if self._pending_metrics:
+            rows, self._pending_metrics = self._pending_metrics, []
+            self._enqueue_io("metrics", rows)
+        if self._pending_logs:
+            rows, self._pending_logs = self._pending_logs, []
+            self._enqueue_io("logs", rows)
+    
+    def _enqueue_io(self, kind: str, item):
+        """Queue an item for the I/O worker, dropping it if the queue is full"""
+        try:
+            self._io_q.put_nowait((kind, item))
+        except queue.Full:
+            io_dropped.labels(kind=kind).inc()
+    
+    def stop_io(self):
+        """Flush what is still buffered and wait for the I/O worker to write it out"""
+        self.flush_logs()
+        self.flush_db()
+        try:
+            self._io_q.put(_IO_STOP, timeout=IO_SHUTDOWN_TIMEOUT)
+        except queue.Full:
+            print("I/O queue still full at shutdown - pending telemetry is lost")
+            return
+        self._io_thread.join(IO_SHUTDOWN_TIMEOUT)
+        if self._io_thread.is_alive():
+            print("I/O worker did not finish in time - pending telemetry is lost")
+    
+    def _io_worker(self):
+        """Drain the I/O queue in batches and submit each kind in one call
 
-    def should_start_incident(self, service: Service) -> Optional[IncidentType]:
+        Returns after writing out the batch that ends with the _IO_STOP sentinel.
+        """
+        stopping = False
+        while not stopping:
+            items = [self._io_q.get()]
+            deadline = time.monotonic() + IO_BATCH_WINDOW
+            while len(items) < IO_BATCH_SIZE and items[-1] is not _IO_STOP:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    items.append(self._io_q.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            if items[-1] is _IO_STOP:
+                items.pop()
+                stopping = True
+            
+            streams = defaultdict(list)
+            metric_rows = []
+            log_rows = []
+            for kind, item in items:
+                if kind == "loki":
+                    for stream_labels, values in item.items():
+                        streams[stream_labels].extend(values)
+                elif kind == "metrics":
+                    metric_rows.extend(item)
+                else:
+                    log_rows.extend(item)
+            
+            if streams:
+                payload = {"streams": []}
+                for stream_labels, entries in streams.items():
+                    labels = dict(stream_labels)
+                    prefix = f" {labels['level'].upper()} [{labels['service']}] "
+                    payload["streams"].append({
+                        "stream": labels,
+                        "values": [
+                            [ts, f"{timestamp}{prefix}{message}{_logfmt(fields)}"]
+                            for ts, timestamp, message, fields in entries
+                        ]
+                    })
+                try:
+                    _LOKI_SESSION.post(LOKI_URL, data=orjson.dumps(payload), headers=_LOKI_HEADERS, timeout=2)
+                except Exception as e:
+                    print(f"Failed to push logs to Loki: {e}")
+            
+            if metric_rows:
+                try:
+                    self.db_service.copy_metrics(metric_rows)
+                except Exception as e:
+                    print(f"Failed to store metrics in database: {e}")
+            
+            if log_rows:
+                try:
+                    self.db_service.copy_logs(log_rows)
+                except Exception as e:
+                    print(f"Failed to store logs in database: {e}")
+
+    def should_start_incident(self, service: Service, now_mono: float) -> Optional[IncidentType]:
         """Enhanced incident starting logic with safety checks"""
         
         # Safety Check 1: Service already has incident
@@ -199,12 +451,11 @@ class IncidentGenerator:
             return None
         
         # Safety Check 2: Too many concurrent incidents
-        active_count = sum(1 for s in SERVICES if s.current_incident is not None)
-        if active_count >= self.max_concurrent_incidents:
+        if self.active_incident_count >= self.max_concurrent_incidents:
             return None
             
         # Safety Check 3: Runtime limit (optional - for testing)
-        runtime_hours = (datetime.datetime.now() - self.generation_start_time).total_seconds() / 3600
+        runtime_hours = (now_mono - self.generation_start_mono) / 3600
         if runtime_hours > 8:  # Stop after 8 hours
             print("Runtime limit reached - stopping incident generation")
             return None
@@ -214,15 +465,15 @@ class IncidentGenerator:
             print("Incident limit reached - stopping generation")
             return None
             
-        # Original probability check
-        for incident_type, config in self.incident_patterns.items():
-            if (service.name in config["services"] and 
-                random.random() < config["probability"]):
-                self.total_incidents_generated += 1
-                return incident_type
-        return None
-
-    def should_end_incident(self, service: Service) -> bool:
+        # Original probability check, as a single draw over this service's cumulative table
+        cumulative, incident_types = self._cum_by_service[service.name]
+        index = bisect.bisect_right(cumulative, self._rng.random())
+        if index == len(incident_types):
+            return None
+        self.total_incidents_generated += 1
+        return incident_types[index]
+
+    def should_end_incident(self, service: Service, now_mono: float) -> bool:
         """Enhanced incident ending with safety timeout"""
         if service.current_incident is None:
             return False
@@ -232,7 +483,7 @@ class IncidentGenerator:
             print(f"Force ending incident on {service.name} - no start time")
             return True
             
-        elapsed = (datetime.datetime.now() - service.incident_start_time).total_seconds()
+        elapsed = now_mono - service.incident_start_mono
         
         # Safety: Force end after 1 hour regardless of duration
         if elapsed > 3600:  # 1 hour
@@ -243,6 +494,10 @@ class IncidentGenerator:
 
     def generate_memory_leak_incident(self, service: Service, pod: str, elapsed_time: int):
         """Generate memory leak incident pattern"""
+        name = service.name
+        labels = self._pod_labels[pod]
+        incident_id = service.current_incident_id
+        
         # Memory grows over time
         memory_growth = min(50, elapsed_time // 5)  # Grows faster for shorter incidents
         memory = min(98, service.base_memory + memory_growth)
@@ -250,233 +505,236 @@ class IncidentGenerator:
         gc_time_ms = random.randint(100, 500)
         
         # Set Prometheus metrics
-        memory_usage.labels(service=service.name, pod=pod).set(memory)
-        cpu_usage.labels(service=service.name, pod=pod).set(cpu)
-        gc_time.labels(service=service.name, gc_type="major").set(gc_time_ms)
+        self._mem[name, pod].set(memory)
+        self._cpu[name, pod].set(cpu)
+        self._gc[name, "major"].set(gc_time_ms)
         
-        # Store metrics in database
-        self.store_metric(service.name, pod, "memory_usage", memory, service.current_incident_id)
-        self.store_metric(service.name, pod, "cpu_usage", cpu, service.current_incident_id)
-        self.store_metric(service.name, pod, "gc_time_ms", gc_time_ms, service.current_incident_id, {"gc_type": "major"})
+        # Store metrics in database; the first sample is always kept, the last one by _flush_incident_tail
+        first = elapsed_time == 0
+        self.store_metric(name, pod, "memory_usage", memory, incident_id, force=first)
+        self.store_metric(name, pod, "cpu_usage", cpu, incident_id, force=first)
+        self.store_metric(name, pod, "gc_time_ms", gc_time_ms, incident_id, {"gc_type": "major"}, force=first)
         
         # Progressive log messages
         if elapsed_time < 30:
-            self.push_log(service.name, "warn", f"Memory usage climbing: {memory}%", {"pod": pod}, service.current_incident_id)
+            self.push_log(name, "warn", "Memory usage climbing", labels, incident_id, {"memory_pct": memory})
         elif elapsed_time < 120:
-            self.push_log(service.name, "error", "OutOfMemoryError: Java heap space", {"pod": pod}, service.current_incident_id)
-            self.push_log(service.name, "warn", "GC overhead limit exceeded", {"pod": pod}, service.current_incident_id)
+            self.push_log(name, "error", "OutOfMemoryError: Java heap space", labels, incident_id)
+            self.push_log(name, "warn", "GC overhead limit exceeded", labels, incident_id)
         else:
-            self.push_log(service.name, "error", "Failed to allocate memory for user session", {"pod": pod}, service.current_incident_id)
-            self.push_log(service.name, "error", "Application becoming unresponsive", {"pod": pod}, service.current_incident_id)
+            self.push_log(name, "error", "Failed to allocate memory for user session", labels, incident_id)
+            self.push_log(name, "error", "Application becoming unresponsive", labels, incident_id)
 
     def generate_cpu_spike_incident(self, service: Service, pod: str, elapsed_time: int):
         """Generate CPU spike incident pattern"""
+        name = service.name
+        labels = self._pod_labels[pod]
+        
         cpu = random.randint(91, 99)
         memory = service.base_memory + random.randint(5, 15)
         
-        cpu_usage.labels(service=service.name, pod=pod).set(cpu)
-        memory_usage.labels(service=service.name, pod=pod).set(memory)
-        response_time.labels(service=service.name, endpoint="/api/users").observe(random.uniform(2.0, 8.0))
+        self._cpu[name, pod].set(cpu)
+        self._mem[name, pod].set(memory)
+        self._rt_observe[name, "/api/users"](random.uniform(2.0, 8.0))
         
-        self.push_log(service.name, "warn", f"High CPU usage detected: {cpu}%", {"pod": pod})
-        self.push_log(service.name, "error", "Thread pool queue at capacity", {"pod": pod})
-        self.push_log(service.name, "warn", "Request processing delays detected", {"pod": pod})
+        self.push_log(name, "warn", "High CPU usage detected", labels, fields={"cpu_pct": cpu})
+        self.push_log(name, "error", "Thread pool queue at capacity", labels)
+        self.push_log(name, "warn", "Request processing delays detected", labels)
 
     def generate_database_slow_incident(self, service: Service, pod: str, elapsed_time: int):
         """Generate database performance incident"""
+        name = service.name
+        labels = self._pod_labels[pod]
+        
         cpu = service.base_cpu + random.randint(10, 30)
         memory = service.base_memory + random.randint(5, 20)
         connections = min(200, service.base_connections + elapsed_time // 3)
         
-        cpu_usage.labels(service=service.name, pod=pod).set(cpu)
-        memory_usage.labels(service=service.name, pod=pod).set(memory)
-        database_connections.labels(service=service.name, db_name="userdb").set(connections)
-        response_time.labels(service=service.name, endpoint="query").observe(random.uniform(5.0, 15.0))
+        self._cpu[name, pod].set(cpu)
+        self._mem[name, pod].set(memory)
+        self._db_conn[name, "userdb"].set(connections)
+        self._rt_observe[name, "query"](random.uniform(5.0, 15.0))
         
-        self.push_log(service.name, "warn", f"Slow query detected: SELECT * FROM users (took {random.randint(5, 15)}s)", {"pod": pod})
-        self.push_log(service.name, "error", f"Connection pool reaching limit: {connections}/200", {"pod": pod})
-        self.push_log(service.name, "warn", "Query timeout threshold exceeded", {"pod": pod})
+        self.push_log(name, "warn", "Slow query detected: SELECT * FROM users", labels, fields={"duration_s": random.randint(5, 15)})
+        self.push_log(name, "error", "Connection pool reaching limit", labels, fields={"connections": connections, "limit": 200})
+        self.push_log(name, "warn", "Query timeout threshold exceeded", labels)
 
     def generate_network_latency_incident(self, service: Service, pod: str, elapsed_time: int):
         """Generate network latency incident"""
+        name = service.name
+        labels = self._pod_labels[pod]
+        
         cpu = service.base_cpu + random.randint(0, 10)
         memory = service.base_memory + random.randint(0, 10)
         latency = random.randint(500, 2000)
         
-        cpu_usage.labels(service=service.name, pod=pod).set(cpu)
-        memory_usage.labels(service=service.name, pod=pod).set(memory)
-        network_latency.labels(service=service.name, target="external_api").set(latency)
-        error_rate.labels(service=service.name, error_type="timeout").set(random.randint(5, 25))
+        self._cpu[name, pod].set(cpu)
+        self._mem[name, pod].set(memory)
+        self._net_latency[name, "external_api"].set(latency)
+        self._errors[name, "timeout"].set(random.randint(5, 25))
         
-        self.push_log(service.name, "error", f"Network timeout to external service (latency: {latency}ms)", {"pod": pod})
-        self.push_log(service.name, "warn", "Increased retry attempts for external calls", {"pod": pod})
-        self.push_log(service.name, "error", "Circuit breaker opened for external service", {"pod": pod})
+        self.push_log(name, "error", "Network timeout to external service", labels, fields={"latency_ms": latency})
+        self.push_log(name, "warn", "Increased retry attempts for external calls", labels)
+        self.push_log(name, "error", "Circuit breaker opened for external service", labels)
 
     def generate_disk_full_incident(self, service: Service, pod: str, elapsed_time: int):
         """Generate disk space incident"""
+        name = service.name
+        labels = self._pod_labels[pod]
+        
         disk_percent = min(99, 70 + elapsed_time // 10)
         cpu = service.base_cpu + random.randint(5, 15)
         memory = service.base_memory
         
-        cpu_usage.labels(service=service.name, pod=pod).set(cpu)
-        memory_usage.labels(service=service.name, pod=pod).set(memory)
-        disk_usage.labels(service=service.name, pod=pod).set(disk_percent)
+        self._cpu[name, pod].set(cpu)
+        self._mem[name, pod].set(memory)
+        self._disk[name, pod].set(disk_percent)
         
         if disk_percent > 90:
-            self.push_log(service.name, "error", f"Disk space critical: {disk_percent}% used", {"pod": pod})
-            self.push_log(service.name, "error", "Failed to write log file: No space left on device", {"pod": pod})
+            self.push_log(name, "error", "Disk space critical", labels, fields={"disk_pct": disk_percent})
+            self.push_log(name, "error", "Failed to write log file: No space left on device", labels)
         else:
-            self.push_log(service.name, "warn", f"Disk space warning: {disk_percent}% used", {"pod": pod})
+            self.push_log(name, "warn", "Disk space warning", labels, fields={"disk_pct": disk_percent})
 
     def generate_connection_leak_incident(self, service: Service, pod: str, elapsed_time: int):
         """Generate connection leak incident"""
+        name = service.name
+        labels = self._pod_labels[pod]
+        
         connections = min(150, service.base_connections + elapsed_time // 2)
         cpu = service.base_cpu + random.randint(0, 10)
         memory = service.base_memory + random.randint(10, 25)
         
-        cpu_usage.labels(service=service.name, pod=pod).set(cpu)
-        memory_usage.labels(service=service.name, pod=pod).set(memory)
-        database_connections.labels(service=service.name, db_name="userdb").set(connections)
+        self._cpu[name, pod].set(cpu)
+        self._mem[name, pod].set(memory)
+        self._db_conn[name, "userdb"].set(connections)
         
-        self.push_log(service.name, "warn", f"Database connection count increasing: {connections}", {"pod": pod})
-        self.push_log(service.name, "error", "Connection pool leak detected", {"pod": pod})
+        self.push_log(name, "warn", "Database connection count increasing", labels, fields={"connections": connections})
+        self.push_log(name, "error", "Connection pool leak detected", labels)
         if connections > 100:
-            self.push_log(service.name, "error", "New connection requests being rejected", {"pod": pod})
+            self.push_log(name, "error", "New connection requests being rejected", labels)
 
     def generate_queue_backlog_incident(self, service: Service, pod: str, elapsed_time: int):
         """Generate message queue backlog incident"""
+        name = service.name
+        labels = self._pod_labels[pod]
+        
         queue_size = min(10000, 100 + elapsed_time * 5)
         cpu = service.base_cpu + random.randint(5, 20)
         memory = service.base_memory + random.randint(5, 15)
         
-        cpu_usage.labels(service=service.name, pod=pod).set(cpu)
-        memory_usage.labels(service=service.name, pod=pod).set(memory)
-        queue_depth.labels(service=service.name, queue_name="user_events").set(queue_size)
+        self._cpu[name, pod].set(cpu)
+        self._mem[name, pod].set(memory)
+        self._queue[name, "user_events"].set(queue_size)
         
-        self.push_log(service.name, "warn", f"Queue depth growing: {queue_size} messages", {"pod": pod})
+        self.push_log(name, "warn", "Queue depth growing", labels, fields={"queue_depth": queue_size})
         if queue_size > 1000:
-            self.push_log(service.name, "error", "Message processing lag detected", {"pod": pod})
+            self.push_log(name, "error", "Message processing lag detected", labels)
         if queue_size > 5000:
-            self.push_log(service.name, "error", "Queue backlog critical - potential data loss", {"pod": pod})
+            self.push_log(name, "error", "Queue backlog critical - potential data loss", labels)
 
     def generate_gc_pressure_incident(self, service: Service, pod: str, elapsed_time: int):
         """Generate garbage collection pressure incident"""
+        name = service.name
+        labels = self._pod_labels[pod]
+        
         cpu = service.base_cpu + random.randint(15, 35)
         memory = service.base_memory + random.randint(10, 25)
         gc_duration = random.randint(200, 1000)
         
-        cpu_usage.labels(service=service.name, pod=pod).set(cpu)
-        memory_usage.labels(service=service.name, pod=pod).set(memory)
-        gc_time.labels(service=service.name, gc_type="major").set(gc_duration)
-        response_time.labels(service=service.name, endpoint="/api/users").observe(random.uniform(1.0, 5.0))
+        self._cpu[name, pod].set(cpu)
+        self._mem[name, pod].set(memory)
+        self._gc[name, "major"].set(gc_duration)
+        self._rt_observe[name, "/api/users"](random.uniform(1.0, 5.0))
         
-        self.push_log(service.name, "warn", f"Frequent garbage collection events (duration: {gc_duration}ms)", {"pod": pod})
-        self.push_log(service.name, "warn", "Application pause time increasing", {"pod": pod})
-        self.push_log(service.name, "error", "GC pressure affecting response times", {"pod": pod})
+        self.push_log(name, "warn", "Frequent garbage collection events", labels, fields={"gc_duration_ms": gc_duration})
+        self.push_log(name, "warn", "Application pause time increasing", labels)
+        self.push_log(name, "error", "GC pressure affecting response times", labels)
 
     def generate_error_burst_incident(self, service: Service, pod: str, elapsed_time: int):
         """Generate error burst incident"""
+        name = service.name
+        labels = self._pod_labels[pod]
+        
         cpu = service.base_cpu + random.randint(0, 15)
         memory = service.base_memory + random.randint(0, 15)
         error_percentage = random.randint(10, 50)
         
-        cpu_usage.labels(service=service.name, pod=pod).set(cpu)
-        memory_usage.labels(service=service.name, pod=pod).set(memory)
-        error_rate.labels(service=service.name, error_type="4xx").set(error_percentage)
-        
-        error_messages = [
-            "HTTP 400 Bad Request: Invalid user ID format",
-            "HTTP 404 Not Found: User profile not found",
-            "HTTP 429 Too Many Requests: Rate limit exceeded",
-            "HTTP 503 Service Unavailable: Downstream service error"
-        ]
+        self._cpu[name, pod].set(cpu)
+        self._mem[name, pod].set(memory)
+        self._errors[name, "4xx"].set(error_percentage)
         
         for _ in range(random.randint(1, 3)):
-            self.push_log(service.name, "error", random.choice(error_messages), {"pod": pod})
+            self.push_log(name, "error", random.choice(ERROR_BURST_MESSAGES), labels)
 
-    def generate_normal_operation(self, service: Service, pod: str):
-        """Generate normal operation metrics and logs"""
-        cpu = service.base_cpu + random.randint(-5, 10)
-        memory = service.base_memory + random.randint(-5, 10)
-        
-        cpu_usage.labels(service=service.name, pod=pod).set(max(1, cpu))
-        memory_usage.labels(service=service.name, pod=pod).set(max(1, memory))
+    # Incident type -> data generator, looked up once per pod instead of walking an if/elif chain
+    _DISPATCH: Dict[IncidentType, Callable] = {
+        IncidentType.MEMORY_LEAK: generate_memory_leak_incident,
+        IncidentType.CPU_SPIKE: generate_cpu_spike_incident,
+        IncidentType.DATABASE_SLOW: generate_database_slow_incident,
+        IncidentType.NETWORK_LATENCY: generate_network_latency_incident,
+        IncidentType.DISK_FULL: generate_disk_full_incident,
+        IncidentType.CONNECTION_LEAK: generate_connection_leak_incident,
+        IncidentType.QUEUE_BACKLOG: generate_queue_backlog_incident,
+        IncidentType.GC_PRESSURE: generate_gc_pressure_incident,
+        IncidentType.ERROR_BURST: generate_error_burst_incident,
+    }
+
+    def generate_normal_operation(self, service: Service, pod: str, cpu: int,
+                                  memory: int, connections: int):
+        """Generate normal operation metrics and logs from pre-computed, pre-clamped values"""
+        self._cpu[service.name, pod].set(cpu)
+        self._mem[service.name, pod].set(memory)
         
         if service.service_type == "database":
-            database_connections.labels(service=service.name, db_name="userdb").set(service.base_connections + random.randint(-5, 5))
+            self._db_conn[service.name, "userdb"].set(connections)
         
         # Occasional normal logs
         if random.random() < 0.05:  # 5% chance - reduced frequency
-            normal_messages = [
-                "Health check completed successfully",
-                f"Processed {random.randint(10, 100)} requests in last minute",
-                "Service startup completed",
-                "Configuration reloaded"
-            ]
-            self.push_log(service.name, "info", random.choice(normal_messages), {"pod": pod})
+            message = random.choice(NORMAL_MESSAGES)
+            fields = {"requests": random.randint(10, 100)} if message == "Processed requests in last minute" else None
+            self.push_log(service.name, "info", message, self._pod_labels[pod], fields=fields)
 
     def generate_incident_data(self, service: Service, pod: str, elapsed_time: int):
         """Centralized incident data generation with error handling"""
         try:
             incident_type = service.current_incident
             
-            if incident_type == IncidentType.MEMORY_LEAK:
-                self.generate_memory_leak_incident(service, pod, elapsed_time)
-            elif incident_type == IncidentType.CPU_SPIKE:
-                self.generate_cpu_spike_incident(service, pod, elapsed_time)
-            elif incident_type == IncidentType.DATABASE_SLOW:
-                self.generate_database_slow_incident(service, pod, elapsed_time)
-            elif incident_type == IncidentType.NETWORK_LATENCY:
-                self.generate_network_latency_incident(service, pod, elapsed_time)
-            elif incident_type == IncidentType.DISK_FULL:
-                self.generate_disk_full_incident(service, pod, elapsed_time)
-            elif incident_type == IncidentType.CONNECTION_LEAK:
-                self.generate_connection_leak_incident(service, pod, elapsed_time)
-            elif incident_type == IncidentType.QUEUE_BACKLOG:
-                self.generate_queue_backlog_incident(service, pod, elapsed_time)
-            elif incident_type == IncidentType.GC_PRESSURE:
-                self.generate_gc_pressure_incident(service, pod, elapsed_time)
-            elif incident_type == IncidentType.ERROR_BURST:
-                self.generate_error_burst_incident(service, pod, elapsed_time)
+            handler = self._DISPATCH.get(incident_type)
+            if handler:
+                handler(self, service, pod, elapsed_time)
             else:
                 print(f"Unknown incident type: {incident_type}")
                 
         except Exception as e:
             print(f"Error in incident data generation: {e}")
 
-    def process_service(self, service: Service):
-        """Enhanced service processing with error handling"""
+    def process_service(self, service: Service, now_dt: datetime.datetime, now_mono: float):
+        """Enhanced service processing with error handling
+        
+        now_dt/now_mono are the tick's wall-clock and monotonic timestamps, taken once per tick.
+        """
         try:
-            current_time = datetime.datetime.now()
-            
             # Check if we should start a new incident
             if service.current_incident is None:
-                new_incident = self.should_start_incident(service)
+                with self._incident_lock:
+                    new_incident = self.should_start_incident(service, now_mono)
+                    if new_incident:
+                        service.current_incident = new_incident
+                        self.active_incident_count += 1
                 if new_incident:
-                    service.current_incident = new_incident
-                    service.incident_start_time = current_time
-                    pattern = self.incident_patterns[new_incident]
+                    service.incident_start_time = now_dt
+                    service.incident_start_mono = now_mono
+                    pattern = INCIDENT_PATTERNS[new_incident]
                     service.incident_duration = random.randint(*pattern["duration_range"])
                     
                     # Create incident in database
                     if self.db_enabled and self.db_service:
                         try:
-                            severity_map = {
-                                IncidentType.MEMORY_LEAK: "high",
-                                IncidentType.CPU_SPIKE: "high",
-                                IncidentType.DATABASE_SLOW: "critical",
-                                IncidentType.NETWORK_LATENCY: "medium",
-                                IncidentType.DISK_FULL: "critical",
-                                IncidentType.CONNECTION_LEAK: "high",
-                                IncidentType.QUEUE_BACKLOG: "medium",
-                                IncidentType.GC_PRESSURE: "medium",
-                                IncidentType.ERROR_BURST: "high"
-                            }
-                            
                             service.current_incident_id = self.db_service.create_incident(
                                 incident_type=new_incident.value,
                                 service_name=service.name,
-                                severity=severity_map.get(new_incident, "medium"),
+                                severity=SEVERITY_MAP.get(new_incident, "medium"),
                                 description=f"{new_incident.value.replace('_', ' ').title()} detected in {service.name}",
                                 affected_pods=service.pods
                             )
@@ -486,8 +744,9 @@ class IncidentGenerator:
                     print(f"Started {new_incident.value} incident on {service.name} (duration: {service.incident_duration}s)")
             
             # Check if we should end current incident
-            elif self.should_end_incident(service):
+            elif self.should_end_incident(service, now_mono):
                 print(f"Resolved {service.current_incident.value} incident on {service.name}")
+                self._flush_incident_tail(service)
                 
                 # Update incident status in database
                 if self.db_enabled and self.db_service and service.current_incident_id:
@@ -495,24 +754,36 @@ class IncidentGenerator:
                         self.db_service.update_incident_status(
                             incident_id=service.current_incident_id,
                             status="resolved",
-                            end_time=current_time
+                            end_time=now_dt,
+                            service_name=service.name
                         )
                     except Exception as e:
                         print(f"Failed to update incident status in database: {e}")
                 
-                service.current_incident = None
+                with self._incident_lock:
+                    service.current_incident = None
+                    self.active_incident_count -= 1
                 service.incident_start_time = None
+                service.incident_start_mono = 0.0
                 service.incident_duration = 0
                 service.current_incident_id = None
             
             # Generate metrics and logs for each pod
-            for pod in service.pods:
+            if service.current_incident:
+                elapsed = int(now_mono - service.incident_start_mono)
+            else:
+                # One vectorized draw of (cpu, memory, connections) for all pods,
+                # with cpu/memory floored at 1 in the same pass
+                values = self._rng.integers(NORMAL_JITTER_LOW, NORMAL_JITTER_HIGH, size=(len(service.pods), 3))
+                values += (service.base_cpu, service.base_memory, service.base_connections)
+                np.maximum(values[:, :2], 1, out=values[:, :2])
+                values = values.tolist()
+            for i, pod in enumerate(service.pods):
                 try:
                     if service.current_incident:
-                        elapsed = int((current_time - service.incident_start_time).total_seconds())
                         self.generate_incident_data(service, pod, elapsed)
                     else:
-                        self.generate_normal_operation(service, pod)
+                        self.generate_normal_operation(service, pod, *values[i])
                         
                 except Exception as e:
                     print(f"Error generating data for {service.name}/{pod}: {e}")
@@ -520,8 +791,13 @@ class IncidentGenerator:
         except Exception as e:
             print(f"Error processing service {service.name}: {e}")
             # Reset service state on error
-            service.current_incident = None
+            self._flush_incident_tail(service)
+            with self._incident_lock:
+                if service.current_incident is not None:
+                    self.active_incident_count -= 1
+                service.current_incident = None
             service.incident_start_time = None
+            service.incident_start_mono = 0.0
 
 def run_incident_generator():
     """Enhanced main loop with graceful shutdown"""
@@ -531,17 +807,31 @@ def run_incident_generator():
     print(f"Safety limits: {generator.max_concurrent_incidents} concurrent incidents max")
     
     try:
+        next_tick = time.monotonic()
         while True:
             try:
-                for service in SERVICES:
-                    generator.process_service(service)
+                now_dt = datetime.datetime.now()
+                now_mono = time.monotonic()
+                generator._tick_ts_str = datetime.datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S")
+                generator._tick_ts_ns = time.time_ns()
+                generator._tick_counter += 1
+                wait([generator._pool.submit(generator.process_service, service, now_dt, now_mono)
+                      for service in SERVICES])
+                generator.flush_logs()
+                generator.flush_db()
                 
                 # Status report every 10 incidents
                 if generator.total_incidents_generated % 10 == 0 and generator.total_incidents_generated > 0:
                     active_incidents = [s.name for s in SERVICES if s.current_incident]
                     print(f"Status: {generator.total_incidents_generated} total incidents, {len(active_incidents)} active")
                 
-                time.sleep(10)  # Generate data every 10 seconds
+                # Generate data every 10 seconds, keeping the cadence stable regardless of tick work
+                next_tick += TICK_INTERVAL
+                delay = next_tick - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                else:
+                    next_tick = time.monotonic()  # overran the interval; restart the schedule
                 
             except KeyboardInterrupt:
                 print("Shutdown requested...")
@@ -550,13 +840,18 @@ def run_incident_generator():
                 print(f"Error in main loop: {e}")
                 print("Continuing after 30 second pause...")
                 time.sleep(30)
+                next_tick = time.monotonic()
                 
     except Exception as e:
         print(f"Fatal error: {e}")
     finally:
+        generator._pool.shutdown(wait=True)
+        generator.stop_io()
         print("Incident generator stopped")
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    
     # Start Prometheus metrics server
     start_http_server(8000)
     print("Metrics endpoint available at :8000/metrics")